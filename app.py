@@ -1,15 +1,101 @@
-from flask import Flask, render_template, request
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, Response, url_for
 from PIL import Image
 import pytesseract
 import os
 import cv2 # <-- NEW IMPORT
 import numpy as np # <-- NEW IMPORT
 import pytesseract
+import sys
+import json
+import shutil
+import threading
+from werkzeug.utils import secure_filename
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from main import FinancialAIAnalyzer
+from ingestion.analysis_jobs import AnalyzerPool, JobStore
+from ocr.vendor_templates import TemplateRegistry
 
 # Add this line with the correct path to tesseract.exe
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-app = Flask(__name__)
+bp = Blueprint('app', __name__)
+
+# Size of the analyzer pool shared by every API request, so models load once
+# and not per document
+ANALYZER_POOL_SIZE = int(os.environ.get("ANALYZER_POOL_SIZE", "2"))
+VENDOR_TEMPLATES = os.environ.get("VENDOR_TEMPLATES")
+
+def create_app(analyzer_factory=None, pool_size=None, template_registry=None):
+    """Build the web app; analyzer_factory lets tests swap in stub analyzers"""
+    app = Flask(__name__)
+    app.config["UPLOAD_FOLDER"] = "uploads"
+    app.register_blueprint(bp)
+
+    if template_registry is None and VENDOR_TEMPLATES:
+        template_registry = TemplateRegistry(VENDOR_TEMPLATES)
+    if analyzer_factory is None:
+        def analyzer_factory():
+            return FinancialAIAnalyzer(template_registry=template_registry)
+
+    app.extensions["analysis"] = {
+        "analyzer_factory": analyzer_factory,
+        "pool_size": pool_size or ANALYZER_POOL_SIZE,
+        "template_registry": template_registry,
+        "job_store": JobStore(),
+        "pool": None,
+        "pool_lock": threading.Lock()
+    }
+    return app
+
+def get_analyzer_pool():
+    """The app's analyzer pool, created on first use
+
+    Creating the pool only starts a background warm-up, so this never blocks a
+    request. It is not created at import or app construction, so the debug
+    reloader's parent process, which serves no requests, never loads models.
+    """
+    analysis = current_app.extensions["analysis"]
+    with analysis["pool_lock"]:
+        if analysis["pool"] is None:
+            analysis["pool"] = AnalyzerPool(analysis["analyzer_factory"], size=analysis["pool_size"])
+    return analysis["pool"]
+
+def get_job_store():
+    return current_app.extensions["analysis"]["job_store"]
+
+def remove_upload_dir(upload_dir):
+    """Best-effort cleanup of a finished job's upload directory"""
+    shutil.rmtree(upload_dir, ignore_errors=True)
+
+def analyze_upload(analyzer, job, index, file_path):
+    """Run the full pipeline on one uploaded document and record the outcome on its job"""
+    if analyzer is None:
+        # No analyzer could be started; fail the document so the job still finishes
+        payload = {"status": "failed", "error": "Analyzer unavailable"}
+    else:
+        try:
+            result = analyzer.process_document(image_path=file_path, compact=True)
+            if isinstance(result, dict):
+                payload = {"status": "failed", "error": result.get("error"), "details": result.get("details")}
+            else:
+                # Kept compact on the job; expanded only when a client reads it
+                payload = {"status": "done", "result": result}
+        except Exception as e:
+            payload = {"status": "failed", "error": "Processing failed", "details": str(e)}
+        # Results live on the job; the analyzer must not keep its own copy
+        analyzer.data_processor.processed_data.clear()
+
+    # Record first so a cleanup failure can never leave the job unfinished
+    finished = job.add_result(index, payload)
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+    if finished:
+        remove_upload_dir(os.path.dirname(file_path))
 
 # NEW FUNCTION: Add this function definition near the top
 def preprocess_image(image_path):
@@ -34,11 +120,11 @@ def preprocess_image(image_path):
     
     return processed_path
 
-@app.route('/')
+@bp.route('/')
 def upload_file():
     return render_template('upload.html')
 
-@app.route('/uploader', methods=['POST'])
+@bp.route('/uploader', methods=['POST'])
 def upload_image():
     if request.method == 'POST':
         f = request.files['file']
@@ -55,5 +141,69 @@ def upload_image():
         
         return render_template('result.html', extracted_text=text)
 
+@bp.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Accept many documents in one multipart request and return a job ID immediately"""
+    # Werkzeug parses the multipart body as a stream, spooling large parts to disk
+    files = [f for f in request.files.getlist('files') if f.filename]
+    if not files:
+        return jsonify({"error": "No files uploaded; send them in the 'files' field"}), 400
+
+    job = get_job_store().create([f.filename for f in files])
+    upload_dir = os.path.join(current_app.config["UPLOAD_FOLDER"], job.job_id)
+    os.makedirs(upload_dir, exist_ok=True)
+
+    analyzer_pool = get_analyzer_pool()
+    for index, f in enumerate(files):
+        file_path = os.path.join(upload_dir, f"{index}_{secure_filename(f.filename)}")
+        try:
+            f.save(file_path)
+        except Exception as e:
+            # Fail this and every unsaved document so the job can still finish
+            for failed_index in range(index, len(files)):
+                if job.add_result(failed_index, {"status": "failed", "error": "Upload failed", "details": str(e)}):
+                    remove_upload_dir(upload_dir)
+            break
+        analyzer_pool.submit(analyze_upload, job, index, file_path)
+
+    return jsonify({
+        "job_id": job.job_id,
+        "documents": job.total,
+        "status_url": url_for('.get_job', job_id=job.job_id),
+        "stream_url": url_for('.stream_job', job_id=job.job_id)
+    }), 202
+
+@bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a job; ?since=N returns only results completed after the first N"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    since = request.args.get('since', 0, type=int)
+    if since < 0:
+        return jsonify({"error": "since must not be negative"}), 400
+    return jsonify(job.snapshot(since=since))
+
+@bp.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Stream per-document results as newline-delimited JSON as they finish"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+
+    def generate():
+        for result in job.iter_results():
+            yield json.dumps(result) + "\n"
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@bp.route('/api/templates/stats', methods=['GET'])
+def template_stats():
+    """Vendor template match rate and estimated time saved"""
+    template_registry = current_app.extensions["analysis"]["template_registry"]
+    if template_registry is None:
+        return jsonify({"error": "No vendor templates configured; set VENDOR_TEMPLATES"}), 404
+    return jsonify(template_registry.report())
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per document for the nested dict result vs DocumentResult
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processing.document_result import DocumentResult
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed',
+                           'Invoice_sample_data_20250908_080118.json')
+
+VENDORS = ["ABC Corp", "Global Supplies Ltd", "Acme Company", "Northwind Traders", "Contoso LLC"]
+CURRENCIES = ["USD", "EUR", "GBP", "INR"]
+
+def fresh(value):
+    """Build a new string object, as re.findall does for every match"""
+    return "".join(list(value))
+
+def make_inputs(sample_text, index, rng):
+    """Synthetic pipeline outputs shaped like OCREngine/NLPEngine results"""
+    page_text = f"{sample_text}\nInvoice No: INV-{index:06d}\n"
+    # Tesseract returns a separate string per config, each a near-identical copy of the page
+    all_results = {f"config_{i}": fresh(page_text) for i in range(3)}
+    ocr_result = {"raw_text": all_results["config_0"], "all_results": all_results, "success": True}
+    vendor = rng.choice(VENDORS)
+    currency = rng.choice(CURRENCIES)
+    # Amounts differ per document, like invoice IDs
+    total = rng.randint(100, 99999) / 100
+    tax = round(total * 0.18, 2)
+    line_item = rng.randint(100, 9999) / 100
+    entities = {
+        "dates": [fresh("2023-01-15")],
+        "organizations": list({fresh(vendor), fresh(rng.choice(VENDORS))}),
+        "persons": [],
+        "money": list({fresh(f"{total:.2f} {currency}"), fresh(f"${line_item:.2f}"), fresh(f"${tax:.2f}")}),
+        "quantities": [],
+        "locations": [],
+        "products": []
+    }
+    financial_data = {
+        "totals": [fresh(f"${total:.2f}")],
+        "taxes": [fresh(f"${tax:.2f}")],
+        "dates": [fresh("2023-01-15")],
+        "ids": [fresh(f"INV-{index:06d}")]
+    }
+    sentiment = {"label": "NEUTRAL", "score": 0.5, "urgency": "LOW",
+                 "positive_keywords": 0, "negative_keywords": 0, "urgent_keywords": 0}
+    return ocr_result, entities, financial_data, sentiment
+
+def structure_as_dict(ocr_result, entities, financial_data, sentiment):
+    """The layout DataProcessor.structure_data returned before DocumentResult"""
+    return {
+        "metadata": {"processing_time": "2025-09-08T08:01:18.372377",
+                     "document_type": "Invoice", "success": True},
+        "text": {"raw_text": ocr_result.get("raw_text", ""),
+                 "detailed_text": ocr_result.get("detailed_text", "")},
+        "entities": entities,
+        "financial_data": financial_data,
+        "sentiment": sentiment
+    }
+
+def measure(build, count):
+    """Retained bytes per document for `count` documents built by `build`"""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(count)]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return retained / count
+
+def main():
+    parser = argparse.ArgumentParser(description='Result memory benchmark')
+    parser.add_argument('--documents', '-n', type=int, default=2000, help='Number of documents to hold')
+    args = parser.parse_args()
+
+    with open(SAMPLE_PATH) as f:
+        sample_text = json.load(f)["text"]["raw_text"]
+
+    def inputs(i):
+        return make_inputs(sample_text, i, random.Random(i))
+
+    def ocr_before(i):
+        return inputs(i)[0]
+
+    def ocr_after(i):
+        ocr_result = inputs(i)[0]
+        # OCREngine.extract_text now drops the per-config copies unless asked to keep them
+        ocr_result.pop("all_results")
+        return ocr_result
+
+    def result_before(i):
+        return structure_as_dict(*inputs(i))
+
+    def result_after(i):
+        ocr_result, entities, financial_data, sentiment = inputs(i)
+        return DocumentResult("2025-09-08T08:01:18.372377", "Invoice", True,
+                              ocr_result["raw_text"], entities, financial_data, sentiment)
+
+    rows = [
+        ("OCR result", measure(ocr_before, args.documents), measure(ocr_after, args.documents)),
+        ("Structured result", measure(result_before, args.documents), measure(result_after, args.documents)),
+    ]
+
+    print(f"Documents held: {args.documents}")
+    print(f"{'':<20}{'before':>12}{'after':>12}{'saved':>9}  (bytes/document)")
+    for name, before_bytes, after_bytes in rows:
+        saved = 100 * (1 - after_bytes / before_bytes)
+        print(f"{name:<20}{before_bytes:>12,.0f}{after_bytes:>12,.0f}{saved:>8.1f}%")
+
+if __name__ == "__main__":
+    main()
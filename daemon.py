@@ -0,0 +1,195 @@
+import os
+import sys
+import argparse
+import queue
+import signal
+import threading
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from main import FinancialAIAnalyzer
+from ingestion.job_queue import JobQueue
+from ingestion.inbox_watcher import InboxWatcher
+from data_processing.document_result import DocumentResult
+from ocr.vendor_templates import TemplateRegistry
+
+class IngestionDaemon:
+    """Long-running service that keeps warm analyzers and feeds them micro-batches"""
+
+    def __init__(self, job_queue, output_dir, watcher=None, workers=2, batch_size=8,
+                 batch_wait=0.2, poll_interval=0.5, tesseract_path=None, template_registry=None,
+                 analyzer_factory=None):
+        self.job_queue = job_queue
+        self.output_dir = output_dir
+        self.watcher = watcher
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.poll_interval = poll_interval
+        self.template_registry = template_registry
+        self.stop_event = threading.Event()
+
+        # Bounded so the dispatcher stops claiming jobs while every worker is busy
+        self.batches = queue.Queue(maxsize=workers)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        if analyzer_factory is None:
+            def analyzer_factory():
+                return FinancialAIAnalyzer(tesseract_path=tesseract_path, template_registry=template_registry)
+
+        # Model startup happens once here instead of once per document
+        print(f"Starting {workers} analyzer worker(s)...")
+        self.analyzers = [analyzer_factory() for _ in range(workers)]
+        self.threads = [
+            threading.Thread(target=self._worker, args=(analyzer,), name=f"analyzer-{i}")
+            for i, analyzer in enumerate(self.analyzers)
+        ]
+
+    def run(self):
+        """Dispatch jobs until a stop signal arrives, then drain in-flight work"""
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+
+        requeued = self.job_queue.requeue_stale()
+        if requeued:
+            print(f"Requeued {requeued} job(s) interrupted by a previous run")
+
+        for thread in self.threads:
+            thread.start()
+
+        print("Daemon running. Press Ctrl+C to stop.")
+        try:
+            while not self.stop_event.is_set():
+                batch = self._collect_batch()
+                if batch:
+                    self.batches.put(batch)
+                else:
+                    self.stop_event.wait(self.poll_interval)
+        finally:
+            # Workers are blocked on the batch queue; without the sentinels an
+            # error in the dispatcher would leave the process hanging
+            print("Stopping: draining in-flight batches...")
+            for _ in self.threads:
+                self.batches.put(None)
+            for thread in self.threads:
+                thread.join()
+
+        print(f"Daemon stopped. Job counts: {self.job_queue.counts()}")
+        if self.template_registry is not None:
+            self.template_registry.print_report()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _handle_signal(self, signum, frame):
+        print(f"Received signal {signum}")
+        self.stop()
+
+    def _collect_batch(self):
+        """Claim up to batch_size jobs, waiting briefly for stragglers to fill the batch"""
+        if self.watcher:
+            self.watcher.scan()
+        batch = self.job_queue.claim(self.batch_size)
+
+        # A short grace period keeps idle latency low while letting bursts share a batch
+        deadline = time.monotonic() + self.batch_wait
+        while batch and len(batch) < self.batch_size and not self.stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.stop_event.wait(min(remaining, 0.05))
+            if self.watcher:
+                self.watcher.scan()
+            batch.extend(self.job_queue.claim(self.batch_size - len(batch)))
+        return batch
+
+    def _worker(self, analyzer):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+
+            paths = [path for _, path in batch]
+            results = analyzer.process_batch(paths, compact=True)
+            for (job_id, path), result in zip(batch, results):
+                try:
+                    self._record(analyzer, job_id, path, result)
+                except Exception as e:
+                    # A dead worker would leave shutdown blocked on the batch queue
+                    print(f"Failed to record job {job_id}: {e}")
+
+            # The processor keeps a history for summary reports; a daemon must not
+            # let it grow without bound
+            analyzer.data_processor.processed_data.clear()
+
+    def _record(self, analyzer, job_id, path, result):
+        if not isinstance(result, DocumentResult):
+            self.job_queue.fail(job_id, f"{result['error']}: {result.get('details', '')}")
+            success = False
+        else:
+            try:
+                doc_type = result.document_type.replace('/', '_')
+                # The job id keeps same-named documents from overwriting each other's output
+                base_filename = f"{doc_type}_{os.path.splitext(os.path.basename(path))[0]}_job{job_id}"
+                json_path, _ = analyzer.data_processor.save_to_file(
+                    result, self.output_dir, base_filename
+                )
+                self.job_queue.complete(job_id, json_path)
+                success = True
+            except Exception as e:
+                self.job_queue.fail(job_id, e)
+                success = False
+
+        if self.watcher:
+            final_path = self.watcher.finish(path, success)
+            if final_path != path:
+                self.job_queue.update_path(job_id, final_path)
+
+def main():
+    """Run the ingestion daemon, or enqueue documents for it"""
+    parser = argparse.ArgumentParser(description='Financial Document Ingestion Daemon')
+    parser.add_argument('--queue', '-q', help='Path to the SQLite job queue', default='./results/jobs.sqlite')
+    parser.add_argument('--inbox', '-i', help='Directory to watch for new documents')
+    parser.add_argument('--output', '-o', help='Output directory for results', default='./results')
+    parser.add_argument('--enqueue', nargs='+', metavar='IMAGE', help='Add documents to the queue and exit')
+    parser.add_argument('--workers', '-w', type=int, default=2, help='Number of warm analyzer workers')
+    parser.add_argument('--batch-size', type=int, default=8, help='Maximum documents per micro-batch')
+    parser.add_argument('--batch-wait', type=float, default=0.2, help='Seconds to wait for a batch to fill')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='Seconds between polls when idle')
+    parser.add_argument('--tesseract', '-t', help='Path to Tesseract executable (if not in PATH)')
+    parser.add_argument('--templates', help='Vendor template registry (JSON) enabling the region-only OCR fast path')
+
+    args = parser.parse_args()
+
+    queue_dir = os.path.dirname(os.path.abspath(args.queue))
+    os.makedirs(queue_dir, exist_ok=True)
+    job_queue = JobQueue(args.queue)
+
+    if args.enqueue:
+        for image_path in args.enqueue:
+            if not os.path.exists(image_path):
+                print(f"Error: File {image_path} does not exist")
+                continue
+            job_id = job_queue.enqueue(os.path.abspath(image_path))
+            print(f"Enqueued {image_path} as job {job_id}")
+        job_queue.close()
+        return
+
+    watcher = InboxWatcher(args.inbox, job_queue) if args.inbox else None
+    daemon = IngestionDaemon(
+        job_queue, args.output,
+        watcher=watcher,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_wait=args.batch_wait,
+        poll_interval=args.poll_interval,
+        tesseract_path=args.tesseract,
+        template_registry=TemplateRegistry(args.templates) if args.templates else None
+    )
+    daemon.run()
+    job_queue.close()
+
+if __name__ == "__main__":
+    main()
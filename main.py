@@ -3,6 +3,7 @@ import os
 import sys
 import argparse
 import json
+import time
 from datetime import datetime
 
 # Add the src directory to the Python path
@@ -12,23 +13,52 @@ from ocr.ocr_engine import OCREngine
 from nlp.nlp_processor import NLPEngine
 from sentiment.sentiment_analyzer import SentimentAnalyzer
 from data_processing.data_processor import DataProcessor
+from ocr.vendor_templates import TemplateRegistry, TEMPLATE_FIELDS
 
 class FinancialAIAnalyzer:
     """Main class for financial document analysis"""
     
-    def __init__(self, tesseract_path=None):
+    def __init__(self, tesseract_path=None, template_registry=None):
         self.ocr_engine = OCREngine(tesseract_path)
         self.nlp_engine = NLPEngine()
         self.sentiment_analyzer = SentimentAnalyzer()
         self.data_processor = DataProcessor()
+        self.template_registry = template_registry
     
-    def process_document(self, image_path=None, image_bytes=None):
-        """Process a financial document"""
-        print("Starting document processing...")
+    def process_document(self, image_path=None, image_bytes=None, compact=False):
+        """Process a financial document
         
+        With compact=True a DocumentResult is returned instead of the nested dict,
+        which keeps batch workers' memory footprint small.
+        """
+        print("Starting document processing...")
+        start_time = time.perf_counter()
+        pipeline = "full"
         
-        print("Performing OCR...")
-        ocr_result = self.ocr_engine.extract_text(image_path, image_bytes)
+        if self.template_registry is not None:
+            image, error = self.ocr_engine.load_image(image_path, image_bytes)
+            if error:
+                print(f"OCR failed: {error}")
+                return {"error": "OCR failed", "details": error}
+            
+            template = self.template_registry.match(image)
+            if template is not None:
+                attempt_start = time.perf_counter()
+                structured_data, region_seconds = self._process_with_template(image, template)
+                if structured_data is not None:
+                    self.template_registry.record("template", time.perf_counter() - start_time)
+                    self._sample_baseline(image, region_seconds)
+                    print("Document processing completed!")
+                    return structured_data if compact else structured_data.to_dict()
+                print("Template fields incomplete, falling back to full OCR...")
+                pipeline = "fallback"
+                attempt_seconds = time.perf_counter() - attempt_start
+            
+            print("Performing OCR...")
+            ocr_result = self.ocr_engine.extract_text(image=image)
+        else:
+            print("Performing OCR...")
+            ocr_result = self.ocr_engine.extract_text(image_path, image_bytes)
         
         if not ocr_result.get("success", False):
             print(f"OCR failed: {ocr_result.get('error', 'Unknown error')}")
@@ -52,12 +82,67 @@ class FinancialAIAnalyzer:
         
         
         print("Structuring data...")
-        structured_data = self.data_processor.structure_data(
+        structured_data = self.data_processor.structure_result(
             ocr_result, nlp_entities, financial_data, sentiment, doc_type
         )
+        if self.template_registry is not None:
+            self.template_registry.record(pipeline, time.perf_counter() - start_time,
+                                          attempt_seconds if pipeline == "fallback" else 0.0)
+        if not compact:
+            structured_data = structured_data.to_dict()
         
         print("Document processing completed!")
         return structured_data
+    
+    def _process_with_template(self, image, template):
+        """Fast path for a known vendor layout: OCR only the field regions
+        
+        Returns the result and the time spent on region OCR. The result is None
+        when the regions do not yield a total or a region holds text that does
+        not parse, so the caller can fall back to the full pipeline.
+        
+        Only the region snippets are read, so raw_text, entities and sentiment
+        are partial; the result is marked with pipeline="template" and the vendor.
+        """
+        print(f"Matched vendor template: {template.vendor}")
+        region_start = time.perf_counter()
+        field_texts = self.ocr_engine.extract_regions(image, template.regions)
+        region_seconds = time.perf_counter() - region_start
+        financial_data, unparsed = self.nlp_engine.extract_template_fields(field_texts)
+        if not financial_data["totals"] or unparsed:
+            return None, region_seconds
+        
+        text = "\n".join(field_texts.values())
+        nlp_entities = self.nlp_engine.extract_entities(text)
+        if template.vendor not in nlp_entities["organizations"]:
+            nlp_entities["organizations"].append(template.vendor)
+        sentiment = self.sentiment_analyzer.analyze_financial_sentiment(text)
+        
+        result = self.data_processor.structure_result(
+            {"raw_text": text, "success": True}, nlp_entities, financial_data,
+            sentiment, template.document_type, pipeline="template", vendor=template.vendor
+        )
+        return result, region_seconds
+    
+    def _sample_baseline(self, image, region_seconds):
+        """Now and then also OCR a matched document in full, to measure the time the template saved"""
+        if not self.template_registry.take_baseline_sample():
+            return
+        start_time = time.perf_counter()
+        ocr_result = self.ocr_engine.extract_text(image=image)
+        if ocr_result.get("success", False):
+            self.template_registry.record_baseline(time.perf_counter() - start_time, region_seconds)
+    
+    def process_batch(self, image_paths, compact=False):
+        """Process several documents, returning one result per path in order"""
+        results = []
+        for image_path in image_paths:
+            try:
+                results.append(self.process_document(image_path=image_path, compact=compact))
+            except Exception as e:
+                # One bad document must not sink the rest of the batch
+                results.append({"error": "Processing failed", "details": str(e)})
+        return results
 
 def main():
     """Main function for command-line usage"""
@@ -65,6 +150,12 @@ def main():
     parser.add_argument('image_path', help='Path to the financial document image')
     parser.add_argument('--output', '-o', help='Output directory for results', default='./results')
     parser.add_argument('--tesseract', '-t', help='Path to Tesseract executable (if not in PATH)')
+    parser.add_argument('--templates', help='Vendor template registry (JSON) enabling the region-only OCR fast path')
+    parser.add_argument('--register-template', metavar='VENDOR',
+                        help='Register the image as a template for VENDOR in --templates and exit')
+    parser.add_argument('--regions', help='Field regions for --register-template as JSON, e.g. '
+                        '\'{"total": [0.6, 0.8, 0.3, 0.05]}\' (x, y, width, height as page fractions; '
+                        f'fields: {", ".join(TEMPLATE_FIELDS)})')
     
     args = parser.parse_args()
     
@@ -77,7 +168,26 @@ def main():
     os.makedirs(args.output, exist_ok=True)
     
     
-    analyzer = FinancialAIAnalyzer(tesseract_path=args.tesseract)
+    template_registry = TemplateRegistry(args.templates) if args.templates else None
+    
+    if args.register_template:
+        if not template_registry or not args.regions:
+            print("Error: --register-template requires --templates and --regions")
+            return
+        image, error = OCREngine(args.tesseract).load_image(args.image_path)
+        if error:
+            print(f"Error: {error}")
+            return
+        try:
+            template_registry.register(args.register_template, image, json.loads(args.regions))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        template_registry.save()
+        print(f"Registered template for {args.register_template} in {args.templates}")
+        return
+    
+    analyzer = FinancialAIAnalyzer(tesseract_path=args.tesseract, template_registry=template_registry)
     result = analyzer.process_document(image_path=args.image_path)
     
     if 'error' in result:
@@ -98,6 +208,8 @@ def main():
     
     print(f"\nProcessing completed successfully!")
     print(f"Document type: {result['metadata']['document_type']}")
+    if result['metadata']['pipeline'] == "template":
+        print(f"Read from the {result['metadata']['vendor']} template regions only; text and sentiment are partial")
     
    
     if result['financial_data'].get('totals'):
@@ -109,6 +221,9 @@ def main():
     
     print(f"Sentiment: {result['sentiment']['label']} (score: {result['sentiment']['score']:.2f})")
     print(f"Urgency: {result['sentiment'].get('urgency', 'LOW')}")
+    
+    if template_registry is not None:
+        template_registry.print_report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
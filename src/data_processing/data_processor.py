@@ -4,6 +4,8 @@ from datetime import datetime
 import os
 import csv
 
+from .document_result import DocumentResult
+
 class DataProcessor:
     """Data processor for structuring and saving results"""
     
@@ -12,32 +14,39 @@ class DataProcessor:
     
     def structure_data(self, ocr_result, nlp_entities, financial_data, sentiment, doc_type):
         """Structure all extracted data into a consistent format"""
-        # Get current timestamp
-        processed_time = datetime.now().isoformat()
-        
-        # Create structured data
-        structured_data = {
-            "metadata": {
-                "processing_time": processed_time,
-                "document_type": doc_type,
-                "success": ocr_result.get("success", False)
-            },
-            "text": {
-                "raw_text": ocr_result.get("raw_text", ""),
-                "detailed_text": ocr_result.get("detailed_text", "")
-            },
-            "entities": nlp_entities,
-            "financial_data": financial_data,
-            "sentiment": sentiment
-        }
+        return self.structure_result(
+            ocr_result, nlp_entities, financial_data, sentiment, doc_type
+        ).to_dict()
+    
+    def structure_result(self, ocr_result, nlp_entities, financial_data, sentiment, doc_type,
+                         pipeline="full", vendor=None):
+        """Structure all extracted data into a compact DocumentResult
+        
+        pipeline records how the document was read: "full" page OCR, or
+        "template" for the region-only fast path of a known vendor.
+        """
+        result = DocumentResult(
+            processing_time=datetime.now().isoformat(),
+            document_type=doc_type,
+            success=ocr_result.get("success", False),
+            raw_text=ocr_result.get("raw_text", ""),
+            entities=nlp_entities,
+            financial_data=financial_data,
+            sentiment=sentiment,
+            pipeline=pipeline,
+            vendor=vendor
+        )
         
         # Add to processed data history
-        self.processed_data.append(structured_data)
+        self.processed_data.append(result)
         
-        return structured_data
+        return result
     
     def to_dataframe(self, structured_data):
         """Convert structured data to pandas DataFrame for analysis"""
+        if isinstance(structured_data, DocumentResult):
+            return pd.DataFrame([structured_data.to_row()])
+        
         # Flatten the data for DataFrame
         flat_data = {
             "document_type": structured_data["metadata"]["document_type"],
@@ -58,6 +67,9 @@ class DataProcessor:
     
     def save_to_file(self, structured_data, output_dir, base_filename=None):
         """Save processed data to files"""
+        if isinstance(structured_data, DocumentResult):
+            structured_data = structured_data.to_dict()
+        
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
@@ -84,6 +96,7 @@ class DataProcessor:
         print(f"- JSON: {json_path}")
         print(f"- CSV: {csv_path}")
         
+        return json_path, csv_path
     
     def generate_summary_report(self, output_dir):
         """Generate a summary report of all processed documents"""
@@ -95,13 +108,13 @@ class DataProcessor:
         summary_data = []
         for data in self.processed_data:
             summary_data.append({
-                "document_type": data["metadata"]["document_type"],
-                "processing_time": data["metadata"]["processing_time"],
-                "total_amount": data["financial_data"].get("totals", [""])[0] if data["financial_data"].get("totals") else "",
-                "tax_amount": data["financial_data"].get("taxes", [""])[0] if data["financial_data"].get("taxes") else "",
-                "date": data["financial_data"].get("dates", [""])[0] if data["financial_data"].get("dates") else "",
-                "sentiment": data["sentiment"].get("label", "NEUTRAL"),
-                "urgency": data["sentiment"].get("urgency", "LOW")
+                "document_type": data.document_type,
+                "processing_time": data.processing_time,
+                "total_amount": data.financial_data["totals"][0] if data.financial_data["totals"] else "",
+                "tax_amount": data.financial_data["taxes"][0] if data.financial_data["taxes"] else "",
+                "date": data.financial_data["dates"][0] if data.financial_data["dates"] else "",
+                "sentiment": data.sentiment.get("label", "NEUTRAL"),
+                "urgency": data.sentiment.get("urgency", "LOW")
             })
         
         summary_df = pd.DataFrame(summary_data)
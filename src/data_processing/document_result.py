@@ -0,0 +1,96 @@
+import sys
+import json
+
+ENTITY_KEYS = ("dates", "organizations", "persons", "money", "quantities", "locations", "products")
+FINANCIAL_KEYS = ("totals", "taxes", "dates", "ids")
+
+# Only vendor names repeat across documents; amounts, dates and invoice IDs are
+# mostly unique, and interning them would only grow the interned table
+INTERNED_KEYS = ("organizations",)
+# Longer captures are free-form OCR text that will not repeat
+MAX_INTERNED_LENGTH = 64
+
+def _compact_values(values, intern=False):
+    """Tuple of values, interning short strings when `intern` is set"""
+    if not intern:
+        return tuple(values)
+    return tuple(sys.intern(value) if isinstance(value, str) and len(value) <= MAX_INTERNED_LENGTH else value
+                 for value in values)
+
+def _compact_groups(groups, keys):
+    groups = groups or {}
+    compact = {key: _compact_values(groups.get(key, ()), key in INTERNED_KEYS) for key in keys}
+    # Keep any extra categories a caller added rather than silently dropping them
+    for key, values in groups.items():
+        if key not in compact:
+            compact[key] = _compact_values(values)
+    return compact
+
+class DocumentResult:
+    """Compact, slotted representation of one analyzed document"""
+
+    __slots__ = ("processing_time", "document_type", "success", "raw_text",
+                 "entities", "financial_data", "sentiment", "pipeline", "vendor")
+
+    def __init__(self, processing_time, document_type, success, raw_text,
+                 entities, financial_data, sentiment, pipeline="full", vendor=None):
+        self.processing_time = processing_time
+        self.document_type = sys.intern(document_type)
+        self.success = success
+        # Only the winning OCR text is kept; the per-config alternatives are dropped
+        self.raw_text = raw_text
+        self.entities = _compact_groups(entities, ENTITY_KEYS)
+        self.financial_data = _compact_groups(financial_data, FINANCIAL_KEYS)
+        self.sentiment = sentiment
+        # "template" results were read from a vendor's field regions only, so their
+        # raw_text, entities and sentiment cover those snippets, not the whole page
+        self.pipeline = sys.intern(pipeline)
+        self.vendor = sys.intern(vendor) if vendor else vendor
+
+    def to_dict(self):
+        """Expand into the nested dict layout produced by DataProcessor.structure_data"""
+        return {
+            "metadata": {
+                "processing_time": self.processing_time,
+                "document_type": self.document_type,
+                "success": self.success,
+                "pipeline": self.pipeline,
+                "vendor": self.vendor
+            },
+            "text": {
+                "raw_text": self.raw_text,
+                "detailed_text": ""
+            },
+            "entities": {key: list(values) for key, values in self.entities.items()},
+            "financial_data": {key: list(values) for key, values in self.financial_data.items()},
+            "sentiment": dict(self.sentiment)
+        }
+
+    def to_json(self, **kwargs):
+        """Serialize to JSON without keeping the expanded dict around"""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_row(self):
+        """Flatten into a single row for CSV/DataFrame output"""
+        return {
+            "document_type": self.document_type,
+            "processing_time": self.processing_time,
+            "total_amounts": ", ".join(self.financial_data.get("totals", ())),
+            "tax_amounts": ", ".join(self.financial_data.get("taxes", ())),
+            "dates": ", ".join(self.financial_data.get("dates", ())),
+            "document_ids": ", ".join(self.financial_data.get("ids", ())),
+            "organizations": ", ".join(self.entities.get("organizations", ())),
+            "persons": ", ".join(self.entities.get("persons", ())),
+            "locations": ", ".join(self.entities.get("locations", ())),
+            "sentiment": self.sentiment.get("label", "NEUTRAL"),
+            "sentiment_score": self.sentiment.get("score", 0.5),
+            "urgency": self.sentiment.get("urgency", "LOW")
+        }
+
+    @staticmethod
+    def to_columns(results):
+        """Columnar layout (column name -> list of values) for many results at once"""
+        rows = [result.to_row() for result in results]
+        if not rows:
+            return {}
+        return {column: [row[column] for row in rows] for column in rows[0]}
@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+class AnalyzerPool:
+    """Fixed set of warm analyzers shared by every request
+
+    Analyzers are built in a background thread so the service starts accepting
+    work immediately; tasks submitted before one is ready simply wait for it.
+    If no analyzer can be built at all, tasks run with analyzer=None so they can
+    record the failure instead of waiting forever.
+    """
+
+    def __init__(self, factory, size=2):
+        self.size = size
+        self.started = 0
+        self.startup_error = None
+        self.analyzers = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="analyzer")
+        # Model startup happens once per analyzer, not once per document
+        threading.Thread(target=self._warm, args=(factory,), name="analyzer-warmup", daemon=True).start()
+
+    def _warm(self, factory):
+        for _ in range(self.size):
+            try:
+                self.analyzers.put(factory())
+                self.started += 1
+            except Exception as e:
+                print(f"Failed to start analyzer: {e}")
+                self.startup_error = e
+                break
+        if self.started == 0:
+            # A single shared placeholder: every task receives None and fails fast.
+            # With at least one working analyzer, tasks just wait for it instead.
+            self.analyzers.put(None)
+
+    def submit(self, fn, *args):
+        """Run fn(analyzer, *args) on the next free analyzer (None if none could start)"""
+        return self.executor.submit(self._run, fn, args)
+
+    def _run(self, fn, args):
+        analyzer = self.analyzers.get()
+        try:
+            return fn(analyzer, *args)
+        finally:
+            self.analyzers.put(analyzer)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+class AnalysisJob:
+    """Per-document results of one batch submission, in completion order"""
+
+    def __init__(self, filenames):
+        self.job_id = uuid.uuid4().hex
+        self.filenames = list(filenames)
+        self.created_at = time.time()
+        self.finished_at = None
+        self.results = []
+        self._condition = threading.Condition()
+
+    @property
+    def total(self):
+        return len(self.filenames)
+
+    @property
+    def finished(self):
+        return len(self.results) == self.total
+
+    def add_result(self, index, payload):
+        """Record the outcome for the document at `index`
+
+        A "result" entry in the payload may be a DocumentResult; it is kept in
+        compact form and only expanded when serialized. Returns True for the
+        call that completed the job.
+        """
+        with self._condition:
+            self.results.append(dict(index=index, filename=self.filenames[index], **payload))
+            self._condition.notify_all()
+            if self.finished:
+                self.finished_at = time.time()
+                return True
+            return False
+
+    @staticmethod
+    def _serialize(entry):
+        result = entry.get("result")
+        if hasattr(result, "to_dict"):
+            entry = dict(entry, result=result.to_dict())
+        return entry
+
+    def snapshot(self, since=0):
+        """Status plus the results completed after the first `since` ones"""
+        if since < 0:
+            raise ValueError("since must not be negative")
+        with self._condition:
+            return {
+                "job_id": self.job_id,
+                "status": "done" if self.finished else "processing",
+                "total": self.total,
+                "completed": len(self.results),
+                "results": [self._serialize(entry) for entry in self.results[since:]]
+            }
+
+    def iter_results(self, timeout=None):
+        """Yield results as documents finish, until the job is complete"""
+        cursor = 0
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: len(self.results) > cursor or self.finished,
+                                                timeout=timeout):
+                    return
+                pending = self.results[cursor:]
+                finished = self.finished
+            for entry in pending:
+                yield self._serialize(entry)
+            cursor += len(pending)
+            if finished and cursor == self.total:
+                return
+
+class JobStore:
+    """In-memory registry of batch jobs; finished jobs expire after `ttl` seconds"""
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, filenames):
+        job = AnalysisJob(filenames)
+        with self._lock:
+            self._expire()
+            self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,76 @@
+import os
+import time
+
+class InboxWatcher:
+    """Polls an inbox directory and hands settled documents to a job queue"""
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+    def __init__(self, inbox_dir, job_queue, settle_seconds=1.0):
+        self.inbox_dir = inbox_dir
+        self.job_queue = job_queue
+        self.settle_seconds = settle_seconds
+        self.processing_dir = os.path.join(inbox_dir, "processing")
+        self.done_dir = os.path.join(inbox_dir, "done")
+        self.failed_dir = os.path.join(inbox_dir, "failed")
+        for path in (self.inbox_dir, self.processing_dir, self.done_dir, self.failed_dir):
+            os.makedirs(path, exist_ok=True)
+        # Size seen on the previous scan, used to skip files still being written
+        self._sizes = {}
+
+    def scan(self):
+        """Move newly arrived documents into processing/ and enqueue them"""
+        now = time.time()
+        seen = {}
+        enqueued = 0
+        with os.scandir(self.inbox_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file() or not entry.name.lower().endswith(self.IMAGE_EXTENSIONS):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # Removed or renamed while scanning
+                    continue
+                seen[entry.name] = stat.st_size
+                if self._sizes.get(entry.name) != stat.st_size or now - stat.st_mtime < self.settle_seconds:
+                    continue
+
+                target = self._unique_path(self.processing_dir, entry.name)
+                try:
+                    os.replace(entry.path, target)
+                except OSError as e:
+                    print(f"Could not claim {entry.path}: {e}")
+                    continue
+                self.job_queue.enqueue(target)
+                seen.pop(entry.name)
+                enqueued += 1
+        self._sizes = seen
+        return enqueued
+
+    def finish(self, path, success):
+        """Move a processed document out of processing/ into done/ or failed/
+
+        Returns the document's final location, which is `path` itself when it
+        was not under processing/ or could not be moved.
+        """
+        if os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.processing_dir):
+            return path
+        target_dir = self.done_dir if success else self.failed_dir
+        target = self._unique_path(target_dir, os.path.basename(path))
+        try:
+            os.replace(path, target)
+        except OSError as e:
+            print(f"Could not move {path}: {e}")
+            return path
+        return target
+
+    @staticmethod
+    def _unique_path(directory, filename):
+        base, ext = os.path.splitext(filename)
+        candidate = os.path.join(directory, filename)
+        counter = 1
+        while os.path.exists(candidate):
+            candidate = os.path.join(directory, f"{base}_{counter}{ext}")
+            counter += 1
+        return candidate
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+class JobQueue:
+    """SQLite-backed queue of documents waiting to be analyzed"""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # A single connection shared by the dispatcher and the workers,
+        # serialized through the lock above
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                result_path TEXT,
+                error TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)")
+
+    def enqueue(self, path):
+        """Add a document to the queue and return its job id"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (path, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (path, self.PENDING, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self, limit):
+        """Atomically mark up to `limit` pending jobs as processing and return them"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.conn.execute(
+                    "SELECT id, path FROM jobs WHERE status = ? ORDER BY id LIMIT ?",
+                    (self.PENDING, limit)
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                    [(self.PROCESSING, now, job_id) for job_id, _ in rows]
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def complete(self, job_id, result_path=None):
+        """Mark a job as successfully processed"""
+        self._finish(job_id, self.DONE, result_path=result_path)
+
+    def fail(self, job_id, error):
+        """Mark a job as failed, keeping the error message"""
+        self._finish(job_id, self.FAILED, error=str(error))
+
+    def _finish(self, job_id, status, result_path=None, error=None):
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, result_path = ?, error = ? WHERE id = ?",
+                (status, now, result_path, error, job_id)
+            )
+
+    def update_path(self, job_id, path):
+        """Point a job at its document's new location after it was moved"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET path = ?, updated_at = ? WHERE id = ?",
+                (path, now, job_id)
+            )
+
+    def requeue_stale(self):
+        """Return jobs left in processing by an earlier run to the pending state"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (self.PENDING, now, self.PROCESSING)
+            )
+            return cursor.rowcount
+
+    def counts(self):
+        """Number of jobs in each status"""
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
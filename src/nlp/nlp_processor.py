@@ -145,4 +145,46 @@ class NLPEngine:
             "taxes": list(set(taxes)),
             "dates": list(set(dates)),
             "ids": list(set(ids))
-        }
\ No newline at end of file
+        }
+    
+    def extract_template_fields(self, field_texts):
+        """Build financial data from OCR text of known template regions
+        
+        Returns the financial data plus the fields whose region held text but no
+        recognizable value, which usually means the template did not fit.
+        """
+        # Money must look like money (currency sign, cents or currency code) so
+        # stray digits such as "18% VAT" or "Page 1 of 2" are never taken as amounts
+        money_pattern = (r'[$€£₹]\s?\d[\d,]*(?:\.\d{1,2})?'
+                         r'|\b\d[\d,]*\.\d{2}\b(?:\s*(?:USD|EUR|GBP|INR))?'
+                         r'|\b\d[\d,]*\s*(?:USD|EUR|GBP|INR)\b')
+        field_patterns = {
+            "total": ("totals", money_pattern),
+            "tax": ("taxes", money_pattern),
+            "date": ("dates", r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2}|'
+                              r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}|'
+                              r'\d{1,2} (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}'),
+            # Require a digit so labels such as "INVOICE NO" are skipped
+            "invoice_id": ("ids", r'\b(?=[A-Z0-9-]*\d)[A-Z0-9][A-Z0-9-]{2,}\b')
+        }
+        
+        financial_data = {"totals": [], "taxes": [], "dates": [], "ids": []}
+        unparsed = []
+        for field, text in field_texts.items():
+            if field not in field_patterns:
+                continue
+            key, pattern = field_patterns[field]
+            matches = [m.group(0).strip() for m in re.finditer(pattern, text, re.IGNORECASE)]
+            if not matches:
+                if text.strip():
+                    unparsed.append(field)
+                continue
+            if pattern is money_pattern:
+                # Labels precede values, so in a region such as
+                # "Subtotal $1,000.00 VAT $180.00" the last amount is the field's own
+                value = matches[-1]
+            else:
+                value = matches[0]
+            financial_data[key].append(value)
+        
+        return financial_data, unparsed
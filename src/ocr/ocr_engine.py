@@ -55,24 +55,36 @@ class OCREngine:
             print(f"Error in image preprocessing: {e}")
             return image
     
-    def extract_text(self, image_path=None, image_bytes=None):
-        """Extract text from image using OCR"""
+    def load_image(self, image_path=None, image_bytes=None):
+        """Load an image from a path or bytes, returning (image, error)"""
+        if image_path:
+            if not os.path.exists(image_path):
+                return None, f"Image path {image_path} does not exist"
+            image = cv2.imread(image_path)
+            if image is None:
+                return None, f"Failed to load image from {image_path}"
+            return image, None
+        elif image_bytes:
+            try:
+                image = Image.open(io.BytesIO(image_bytes))
+                return np.array(image), None
+            except Exception as e:
+                return None, f"Failed to process image bytes: {str(e)}"
+        return None, "No image provided"
+    
+    def extract_text(self, image_path=None, image_bytes=None, keep_all_results=False, image=None):
+        """Extract text from image using OCR
+        
+        Only the winning text is returned unless keep_all_results is set; the
+        per-config outputs are near-identical copies of the page. An already
+        loaded image can be passed to skip reading it again.
+        """
         try:
             # Load image
-            if image_path:
-                if not os.path.exists(image_path):
-                    return {"error": f"Image path {image_path} does not exist", "success": False}
-                image = cv2.imread(image_path)
-                if image is None:
-                    return {"error": f"Failed to load image from {image_path}", "success": False}
-            elif image_bytes:
-                try:
-                    image = Image.open(io.BytesIO(image_bytes))
-                    image = np.array(image)
-                except Exception as e:
-                    return {"error": f"Failed to process image bytes: {str(e)}", "success": False}
-            else:
-                return {"error": "No image provided", "success": False}
+            if image is None:
+                image, error = self.load_image(image_path, image_bytes)
+                if error:
+                    return {"error": error, "success": False}
             
             # Preprocess image
             processed_image = self.preprocess_image(image)
@@ -95,14 +107,35 @@ class OCREngine:
             # Use the result with the most text (likely the most accurate)
             best_result = max(results.values(), key=len) if results else ""
             
-            return {
+            ocr_result = {
                 "raw_text": best_result,
-                "all_results": results,
                 "success": True
             }
+            if keep_all_results:
+                ocr_result["all_results"] = results
+            return ocr_result
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    def extract_regions(self, image, regions):
+        """OCR only the given page-relative (x, y, width, height) regions"""
+        height, width = image.shape[:2]
+        texts = {}
+        for field, (x, y, w, h) in regions.items():
+            left, top = max(0, int(x * width)), max(0, int(y * height))
+            right, bottom = min(width, int((x + w) * width)), min(height, int((y + h) * height))
+            if right <= left or bottom <= top:
+                texts[field] = ""
+                continue
+            crop = self.preprocess_image(image[top:bottom, left:right])
+            try:
+                # A region holds a single field value, so treat it as one line of text
+                texts[field] = pytesseract.image_to_string(crop, config=r'--oem 3 --psm 7').strip()
+            except Exception as e:
+                print(f"OCR of region {field} failed: {e}")
+                texts[field] = ""
+        return texts
+    
     def detect_document_type(self, text):
         """Heuristic method to detect document type"""
         text_lower = text.lower()
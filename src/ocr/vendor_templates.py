@@ -0,0 +1,252 @@
+import base64
+import cv2
+import json
+import numbers
+import numpy as np
+import os
+import threading
+
+# Fraction of the page height used for the header signature
+HEADER_FRACTION = 0.2
+# The header is normalized to this size before edge detection so the
+# signature does not depend on scan resolution
+HEADER_SIZE = (960, 240)
+# Signature grid (width, height)
+SIGNATURE_SIZE = (192, 48)
+# Signature cells the match may shift in each direction, absorbing small scan offsets
+MAX_SHIFT = 4
+# Minimum spread of edge strength across the header; blank or noise-only
+# headers fall below it and are never matched
+MIN_DETAIL = 10.0
+# Minimum normalized correlation between signatures to accept a match
+MIN_SCORE = 0.92
+# Every Nth matched document is also OCR'd in full to measure the time saved
+BASELINE_EVERY = 20
+
+TEMPLATE_FIELDS = ("total", "tax", "date", "invoice_id")
+
+def layout_signature(image):
+    """Blurred edge map of a low-resolution crop of the page header
+
+    Edges rather than raw intensity are used so that text carries the weight;
+    a solid logo block or banner contributes only its outline.
+    """
+    if len(image.shape) > 2:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+    header = gray[:max(1, int(gray.shape[0] * HEADER_FRACTION))]
+    header = cv2.resize(header, HEADER_SIZE, interpolation=cv2.INTER_AREA)
+    # Blur before and after edge detection so scan noise averages out
+    header = cv2.GaussianBlur(header, (0, 0), 1.5)
+    edges = cv2.magnitude(cv2.Sobel(header, cv2.CV_32F, 1, 0), cv2.Sobel(header, cv2.CV_32F, 0, 1))
+    edges = cv2.GaussianBlur(edges, (0, 0), 3)
+    return cv2.resize(edges, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+
+def signature_score(template_signature, signature):
+    """Best normalized correlation of two signatures over small shifts"""
+    inner = template_signature[MAX_SHIFT:-MAX_SHIFT, MAX_SHIFT:-MAX_SHIFT]
+    return float(cv2.matchTemplate(signature, inner, cv2.TM_CCOEFF_NORMED).max())
+
+def has_detail(signature):
+    return float(signature.std()) >= MIN_DETAIL
+
+def aspect_ratio(image):
+    return image.shape[0] / image.shape[1]
+
+def validate_regions(regions):
+    """Raise ValueError unless every region is a known field with a 4-number box inside the page"""
+    unknown = set(regions) - set(TEMPLATE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown template fields: {', '.join(sorted(unknown))}")
+    for field, box in regions.items():
+        if (not isinstance(box, (list, tuple)) or len(box) != 4
+                or not all(isinstance(v, numbers.Real) and not isinstance(v, bool) for v in box)):
+            raise ValueError(f"Region {field} must be [x, y, width, height], got {box!r}")
+        x, y, w, h = box
+        if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > 1 or y + h > 1:
+            raise ValueError(f"Region {field} must lie within the page (fractions 0-1) "
+                             f"with positive width and height, got {box!r}")
+
+class VendorTemplate:
+    """Known vendor layout: header signature plus field regions in page-relative coordinates"""
+
+    def __init__(self, vendor, signature, aspect_ratio, regions, document_type="Invoice"):
+        validate_regions(regions)
+        self.vendor = vendor
+        self.signature = signature.astype(np.float32)
+        self.aspect_ratio = aspect_ratio
+        # field -> (x, y, width, height), each as a fraction of the page size
+        self.regions = {field: tuple(box) for field, box in regions.items()}
+        self.document_type = document_type
+
+    def to_dict(self):
+        # Correlation ignores scale, so the signature is stored as compact 8-bit values
+        peak = float(self.signature.max()) or 1.0
+        quantized = np.round(self.signature * (255.0 / peak)).astype(np.uint8)
+        return {
+            "vendor": self.vendor,
+            "document_type": self.document_type,
+            "signature": base64.b64encode(quantized.tobytes()).decode("ascii"),
+            "aspect_ratio": self.aspect_ratio,
+            "regions": {field: list(box) for field, box in self.regions.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        width, height = SIGNATURE_SIZE
+        signature = np.frombuffer(base64.b64decode(data["signature"]), dtype=np.uint8)
+        return cls(
+            vendor=data["vendor"],
+            signature=signature.reshape(height, width),
+            aspect_ratio=data["aspect_ratio"],
+            regions=data["regions"],
+            document_type=data.get("document_type", "Invoice")
+        )
+
+class TemplateRegistry:
+    """Registry of known vendor templates, with match-rate and time-saved statistics"""
+
+    def __init__(self, path=None, min_score=MIN_SCORE, max_aspect_difference=0.05,
+                 baseline_every=BASELINE_EVERY):
+        self.path = path
+        self.min_score = min_score
+        self.max_aspect_difference = max_aspect_difference
+        # 0 disables baseline sampling, and with it the time-saved estimate
+        self.baseline_every = baseline_every
+        self.templates = []
+        self._lock = threading.Lock()
+        self._hits = 0
+        # Documents handled by the region-only path, by the full pipeline after
+        # no match, and by the full pipeline after a match whose fields did not parse.
+        # Baseline samples time full-page and region OCR on the same matched image.
+        self.stats = {
+            "documents": 0,
+            "matched": 0,
+            "fallback": 0,
+            "template_seconds": 0.0,
+            "full_seconds": 0.0,
+            "fallback_seconds": 0.0,
+            "fallback_attempt_seconds": 0.0,
+            "baseline_samples": 0,
+            "baseline_full_ocr_seconds": 0.0,
+            "baseline_region_ocr_seconds": 0.0
+        }
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def load(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        self.templates = []
+        for entry in data.get("templates", []):
+            try:
+                self.templates.append(VendorTemplate.from_dict(entry))
+            except (KeyError, ValueError) as e:
+                print(f"Skipping invalid template {entry.get('vendor', '?')}: {e}")
+        print(f"Loaded {len(self.templates)} vendor template(s) from {path}")
+
+    def save(self, path=None):
+        path = path or self.path
+        with open(path, 'w') as f:
+            json.dump({"templates": [t.to_dict() for t in self.templates]}, f, indent=2)
+
+    def register(self, vendor, image, regions, document_type="Invoice"):
+        """Add a template built from a sample document of this vendor"""
+        signature = layout_signature(image)
+        if not has_detail(signature):
+            raise ValueError("Sample header has too little detail to identify the vendor")
+        template = VendorTemplate(vendor, signature, aspect_ratio(image), regions, document_type)
+        self.templates = [t for t in self.templates if t.vendor != vendor]
+        self.templates.append(template)
+        return template
+
+    def match(self, image):
+        """Best-correlating template scoring at least min_score, or None"""
+        if not self.templates:
+            return None
+        signature = layout_signature(image)
+        if not has_detail(signature):
+            return None
+        ratio = aspect_ratio(image)
+        best, best_score = None, self.min_score
+        for template in self.templates:
+            if abs(template.aspect_ratio - ratio) > self.max_aspect_difference * template.aspect_ratio:
+                continue
+            score = signature_score(template.signature, signature)
+            if score >= best_score:
+                best, best_score = template, score
+        return best
+
+    def record(self, path, seconds, attempt_seconds=0.0):
+        """Record how one document was processed ("template", "full" or "fallback") and how long it took
+
+        For a fallback, attempt_seconds is the time spent on the abandoned region-only attempt.
+        """
+        with self._lock:
+            self.stats["documents"] += 1
+            if path == "template":
+                self.stats["matched"] += 1
+            elif path == "fallback":
+                self.stats["fallback"] += 1
+                self.stats["fallback_attempt_seconds"] += attempt_seconds
+            self.stats[f"{path}_seconds"] += seconds
+
+    def take_baseline_sample(self):
+        """Whether this matched document should also be OCR'd in full (the first and every Nth)"""
+        if not self.baseline_every:
+            return False
+        with self._lock:
+            self._hits += 1
+            return (self._hits - 1) % self.baseline_every == 0
+
+    def record_baseline(self, full_ocr_seconds, region_ocr_seconds):
+        """Record full-page and region OCR times measured on the same matched image"""
+        with self._lock:
+            self.stats["baseline_samples"] += 1
+            self.stats["baseline_full_ocr_seconds"] += full_ocr_seconds
+            self.stats["baseline_region_ocr_seconds"] += region_ocr_seconds
+
+    def report(self):
+        """Match rate and estimated time saved against full-page OCR
+
+        The saving per matched document is measured on sampled matched images
+        themselves, so it does not depend on unmatched documents being processed
+        too. It counts OCR time only (the NLP models also run on less text), and
+        the abandoned attempts of fallbacks are charged against it. It is None
+        until a baseline sample has been taken.
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        documents = stats["documents"]
+        matched = stats["matched"]
+        fallback = stats["fallback"]
+        samples = stats["baseline_samples"]
+        full = documents - matched - fallback
+        avg_full_ocr = avg_region_ocr = seconds_saved = None
+        if samples:
+            avg_full_ocr = stats["baseline_full_ocr_seconds"] / samples
+            avg_region_ocr = stats["baseline_region_ocr_seconds"] / samples
+            seconds_saved = (avg_full_ocr - avg_region_ocr) * matched - stats["fallback_attempt_seconds"]
+        return {
+            "documents": documents,
+            "matched": matched,
+            "fallback": fallback,
+            "match_rate": matched / documents if documents else 0.0,
+            "avg_full_seconds": stats["full_seconds"] / full if full else None,
+            "avg_template_seconds": stats["template_seconds"] / matched if matched else None,
+            "baseline_samples": samples,
+            "avg_full_ocr_seconds": avg_full_ocr,
+            "avg_region_ocr_seconds": avg_region_ocr,
+            "estimated_seconds_saved": seconds_saved
+        }
+
+    def print_report(self):
+        report = self.report()
+        print(f"Template match rate: {report['matched']}/{report['documents']} "
+              f"({report['match_rate']:.0%}), fallbacks: {report['fallback']}")
+        if report["estimated_seconds_saved"] is not None:
+            print(f"Average OCR time on matched documents: full page {report['avg_full_ocr_seconds']:.2f}s, "
+                  f"regions {report['avg_region_ocr_seconds']:.2f}s "
+                  f"({report['baseline_samples']} sample(s))")
+            print(f"Estimated time saved: {report['estimated_seconds_saved']:.1f}s")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch job store and analyzer pool behind the JSON API
+"""
+
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ingestion.analysis_jobs import AnalyzerPool, JobStore
+
+def test_analysis_jobs():
+    """Documents run on pooled analyzers and results stream back as they finish"""
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    pool = AnalyzerPool(factory, size=2)
+    store = JobStore()
+    job = store.create(["a.png", "b.png", "c.png"])
+    assert store.get(job.job_id) is job
+
+    class CompactResult:
+        def to_dict(self):
+            return {"raw_text": "expanded"}
+
+    completions = []
+
+    def analyze(analyzer, index):
+        assert analyzer in created
+        completions.append(job.add_result(index, {"status": "done", "result": CompactResult()}))
+
+    for index in range(job.total):
+        pool.submit(analyze, index)
+
+    streamed = list(job.iter_results(timeout=5))
+    pool.shutdown()
+
+    assert len(created) == 2
+    # Exactly one call reports that it completed the job
+    assert sorted(completions) == [False, False, True]
+    # Results stay compact on the job and are expanded only when serialized
+    assert all(isinstance(entry["result"], CompactResult) for entry in job.results)
+    assert streamed[0]["result"] == {"raw_text": "expanded"}
+    assert sorted(result["index"] for result in streamed) == [0, 1, 2]
+    snapshot = job.snapshot(since=2)
+    assert snapshot["status"] == "done"
+    assert snapshot["completed"] == 3
+    assert snapshot["results"] == streamed[2:]
+
+    try:
+        job.snapshot(since=-1)
+        assert False, "negative since must be rejected"
+    except ValueError:
+        pass
+
+def test_analyzer_pool_startup_failure():
+    """Tasks get analyzer=None when none can start, and never mix it with working analyzers"""
+    def failing():
+        raise RuntimeError("model missing")
+
+    pool = AnalyzerPool(failing, size=2)
+    futures = [pool.submit(lambda analyzer: analyzer) for _ in range(3)]
+    assert [future.result(timeout=5) for future in futures] == [None, None, None]
+    assert "model missing" in str(pool.startup_error)
+    pool.shutdown()
+
+    working = object()
+    built = []
+
+    def partly_failing():
+        if built:
+            raise RuntimeError("out of memory")
+        built.append(working)
+        return working
+
+    pool = AnalyzerPool(partly_failing, size=2)
+    futures = [pool.submit(lambda analyzer: analyzer) for _ in range(4)]
+    assert all(future.result(timeout=5) is working for future in futures)
+    assert pool.started == 1
+    pool.shutdown()
+
+if __name__ == "__main__":
+    test_analysis_jobs()
+    test_analyzer_pool_startup_failure()
+    print("Analysis jobs tested!")
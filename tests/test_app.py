@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch JSON API, using stub analyzers
+"""
+
+import io
+import json
+import os
+import sys
+import time
+
+# Add the repository root and src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app import create_app
+from data_processing.data_processor import DataProcessor
+from ocr.vendor_templates import TemplateRegistry
+
+class StubAnalyzer:
+    """Stands in for FinancialAIAnalyzer without loading any models"""
+
+    def __init__(self):
+        self.data_processor = DataProcessor()
+
+    def process_document(self, image_path=None, image_bytes=None, compact=False):
+        return self.data_processor.structure_result(
+            {"raw_text": f"Invoice {os.path.basename(image_path)} total $1.00", "success": True},
+            {}, {"totals": ["$1.00"]}, {"label": "NEUTRAL", "score": 0.5}, "Invoice"
+        )
+
+def make_client(tmp_path, analyzer_factory=StubAnalyzer):
+    app = create_app(analyzer_factory=analyzer_factory, pool_size=1)
+    app.config["UPLOAD_FOLDER"] = str(tmp_path / "uploads")
+    return app.test_client()
+
+def upload(client, *names):
+    files = [(io.BytesIO(b"image bytes"), name) for name in names]
+    return client.post('/api/jobs', data={"files": files}, content_type='multipart/form-data')
+
+def wait_until_done(client, job_id):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        snapshot = client.get(f'/api/jobs/{job_id}').get_json()
+        if snapshot["status"] == "done":
+            return snapshot
+        time.sleep(0.05)
+    assert False, "job did not finish"
+
+def test_api_jobs(tmp_path):
+    """Uploads return a job at once; results can be polled and streamed as NDJSON"""
+    client = make_client(tmp_path)
+    response = upload(client, "a.png", "b.png")
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["documents"] == 2
+    assert body["status_url"] == f"/api/jobs/{body['job_id']}"
+
+    lines = client.get(body["stream_url"]).get_data(as_text=True).splitlines()
+    streamed = [json.loads(line) for line in lines]
+    assert sorted(result["index"] for result in streamed) == [0, 1]
+    assert all(result["status"] == "done" for result in streamed)
+
+    snapshot = wait_until_done(client, body["job_id"])
+    assert snapshot["completed"] == 2
+    assert len(client.get(f"{body['status_url']}?since=1").get_json()["results"]) == 1
+    # Uploads are removed once the job is done
+    assert os.listdir(tmp_path / "uploads") == []
+
+def test_api_errors(tmp_path):
+    """Bad requests and unknown jobs are rejected"""
+    client = make_client(tmp_path)
+    assert client.post('/api/jobs', data={}, content_type='multipart/form-data').status_code == 400
+    assert client.get('/api/jobs/missing').status_code == 404
+    assert client.get('/api/jobs/missing/stream').status_code == 404
+
+    job_id = upload(client, "a.png").get_json()["job_id"]
+    assert client.get(f'/api/jobs/{job_id}?since=-1').status_code == 400
+
+def test_api_analyzer_unavailable(tmp_path):
+    """When no analyzer can start, documents fail and the job still finishes"""
+    def failing():
+        raise RuntimeError("model missing")
+
+    client = make_client(tmp_path, analyzer_factory=failing)
+    job_id = upload(client, "a.png", "b.png").get_json()["job_id"]
+    snapshot = wait_until_done(client, job_id)
+    assert [result["error"] for result in snapshot["results"]] == ["Analyzer unavailable"] * 2
+
+def test_api_template_stats(tmp_path):
+    """Template statistics are served when a registry is configured"""
+    assert make_client(tmp_path).get('/api/templates/stats').status_code == 404
+
+    registry = TemplateRegistry()
+    registry.record("template", 0.5)
+    app = create_app(analyzer_factory=StubAnalyzer, pool_size=1, template_registry=registry)
+    response = app.test_client().get('/api/templates/stats')
+    assert response.status_code == 200
+    assert response.get_json()["matched"] == 1
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_api_jobs, test_api_errors, test_api_analyzer_unavailable, test_api_template_stats):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("API tested!")
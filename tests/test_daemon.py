@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the ingestion daemon and inbox watcher, using stub analyzers
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the repository root and src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from daemon import IngestionDaemon
+from ingestion.job_queue import JobQueue
+from ingestion.inbox_watcher import InboxWatcher
+from data_processing.data_processor import DataProcessor
+
+class StubAnalyzer:
+    """Stands in for FinancialAIAnalyzer without loading any models"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.data_processor = DataProcessor()
+        self.batches = []
+
+    def process_batch(self, image_paths, compact=False):
+        self.batches.append(list(image_paths))
+        time.sleep(self.delay)
+        return [
+            self.data_processor.structure_result(
+                {"raw_text": "Invoice total $1.00", "success": True}, {}, {"totals": ["$1.00"]},
+                {"label": "NEUTRAL", "score": 0.5}, "Invoice"
+            )
+            for _ in image_paths
+        ]
+
+def make_daemon(tmp_path, job_queue, **kwargs):
+    return IngestionDaemon(job_queue, str(tmp_path / "out"), analyzer_factory=StubAnalyzer, **kwargs)
+
+def test_inbox_watcher(tmp_path):
+    """Files are claimed only once their size is stable, and finish() files them away"""
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    watcher = InboxWatcher(str(tmp_path / "inbox"), job_queue, settle_seconds=0)
+    document = tmp_path / "inbox" / "invoice.png"
+
+    document.write_bytes(b"part")
+    assert watcher.scan() == 0
+    document.write_bytes(b"partial upload")
+    assert watcher.scan() == 0
+    assert watcher.scan() == 1
+    assert not document.exists()
+
+    [(job_id, path)] = job_queue.claim(5)
+    assert os.path.dirname(path) == watcher.processing_dir
+    done_path = watcher.finish(path, success=True)
+    assert os.path.dirname(done_path) == watcher.done_dir and os.path.exists(done_path)
+
+    # Documents that were not claimed from the inbox are left where they are
+    assert watcher.finish(str(tmp_path / "elsewhere.png"), success=False) == str(tmp_path / "elsewhere.png")
+    job_queue.close()
+
+def test_collect_batch(tmp_path):
+    """Jobs are grouped into micro-batches capped at batch_size, waiting at most batch_wait"""
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    daemon = make_daemon(tmp_path, job_queue, workers=1, batch_size=3, batch_wait=0.3)
+
+    for i in range(5):
+        job_queue.enqueue(f"doc_{i}.png")
+    assert len(daemon._collect_batch()) == 3
+
+    # Two left: a straggler arriving within the wait joins the batch
+    timer = threading.Timer(0.1, job_queue.enqueue, args=("late.png",))
+    timer.start()
+    assert [path for _, path in daemon._collect_batch()] == ["doc_3.png", "doc_4.png", "late.png"]
+
+    # A lone job is dispatched once the wait runs out
+    job_queue.enqueue("alone.png")
+    start = time.monotonic()
+    assert len(daemon._collect_batch()) == 1
+    assert 0.25 <= time.monotonic() - start < 1.0
+
+    assert daemon._collect_batch() == []
+    job_queue.close()
+
+def test_stop_drains_in_flight(tmp_path):
+    """Claimed batches finish after stop, and same-named documents get separate outputs"""
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    daemon = IngestionDaemon(job_queue, str(tmp_path / "out"), workers=1, batch_size=2,
+                             batch_wait=0, poll_interval=0.05,
+                             analyzer_factory=lambda: StubAnalyzer(delay=0.3))
+    for directory in ("a", "b", "c", "d"):
+        job_queue.enqueue(os.path.join(directory, "invoice.png"))
+
+    threading.Timer(0.1, daemon.stop).start()
+    daemon.run()
+
+    counts = job_queue.counts()
+    assert counts.get("processing", 0) == 0
+    assert counts["done"] >= 2
+    result_paths = [row[0] for row in job_queue.conn.execute(
+        "SELECT result_path FROM jobs WHERE status = 'done'")]
+    assert len(set(result_paths)) == len(result_paths)
+    job_queue.close()
+
+def test_dispatcher_error_stops_workers(tmp_path):
+    """An error while collecting jobs shuts the workers down instead of hanging"""
+    class BrokenWatcher:
+        def scan(self):
+            raise OSError("inbox unavailable")
+
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    daemon = make_daemon(tmp_path, job_queue, watcher=BrokenWatcher(), workers=2)
+    try:
+        daemon.run()
+        assert False, "the dispatcher error must propagate"
+    except OSError:
+        pass
+    assert not any(thread.is_alive() for thread in daemon.threads)
+    job_queue.close()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_inbox_watcher, test_collect_batch, test_stop_drains_in_flight,
+                 test_dispatcher_error_stops_workers):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("Daemon tested!")
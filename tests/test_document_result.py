@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact DocumentResult representation
+"""
+
+import os
+import sys
+import json
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing.document_result import DocumentResult
+
+def test_document_result():
+    """DocumentResult round-trips to the structure_data layout and interns entity strings"""
+    ocr_result = {"raw_text": "Invoice from ABC Corp", "all_results": {"config_0": "..."}, "success": True}
+    entities = {"organizations": ["".join(["ABC", " Corp"])], "money": ["$100.00"]}
+    financial_data = {"totals": ["$100.00"], "taxes": [], "dates": [], "ids": ["".join(["INV", "-1"])]}
+    sentiment = {"label": "NEUTRAL", "score": 0.5, "urgency": "LOW"}
+
+    result = DocumentResult("2025-01-01T00:00:00", "Invoice", True, ocr_result["raw_text"],
+                            entities, financial_data, sentiment)
+    other = DocumentResult("2025-01-01T00:00:00", "Invoice", True, "",
+                           {"organizations": ["".join(["ABC", " Corp"])]},
+                           {"ids": ["".join(["INV", "-1"])]}, sentiment)
+    # Vendor names repeat and are shared; unique values such as invoice IDs are not interned
+    assert result.entities["organizations"][0] is other.entities["organizations"][0]
+    assert result.financial_data["ids"][0] is not other.financial_data["ids"][0]
+
+    data = json.loads(result.to_json())
+    assert data["text"] == {"raw_text": "Invoice from ABC Corp", "detailed_text": ""}
+    assert data["entities"]["organizations"] == ["ABC Corp"]
+    assert data["entities"]["persons"] == []
+    assert data["financial_data"]["ids"] == ["INV-1"]
+
+    assert data["metadata"]["pipeline"] == "full" and data["metadata"]["vendor"] is None
+    template_result = DocumentResult("2025-01-01T00:00:00", "Invoice", True, "Total $100.00",
+                                     entities, financial_data, sentiment, pipeline="template", vendor="ABC Corp")
+    assert template_result.to_dict()["metadata"]["pipeline"] == "template"
+    assert template_result.to_dict()["metadata"]["vendor"] == "ABC Corp"
+
+    columns = DocumentResult.to_columns([result, other])
+    assert columns["total_amounts"] == ["$100.00", ""]
+    assert columns["organizations"] == ["ABC Corp", "ABC Corp"]
+
+if __name__ == "__main__":
+    test_document_result()
+    print("DocumentResult tested!")
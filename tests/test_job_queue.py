@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite job queue used by the ingestion daemon
+"""
+
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ingestion.job_queue import JobQueue
+
+def test_job_queue(tmp_path):
+    """Jobs are claimed once, in order, and stale claims can be requeued"""
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    ids = [job_queue.enqueue(f"doc_{i}.png") for i in range(3)]
+
+    claimed = job_queue.claim(2)
+    assert [job_id for job_id, _ in claimed] == ids[:2]
+    assert job_queue.claim(2) == [(ids[2], "doc_2.png")]
+    assert job_queue.claim(2) == []
+
+    job_queue.complete(ids[0], "result.json")
+    job_queue.fail(ids[1], "OCR failed")
+    assert job_queue.counts() == {"done": 1, "failed": 1, "processing": 1}
+
+    assert job_queue.requeue_stale() == 1
+    assert job_queue.claim(5) == [(ids[2], "doc_2.png")]
+    job_queue.close()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_job_queue(pathlib.Path(tmp))
+    print("Job queue tested!")
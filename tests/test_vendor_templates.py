@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for vendor template fingerprinting, matching and region parsing
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ocr.vendor_templates import TemplateRegistry
+from src.nlp.nlp_processor import NLPEngine
+
+REGIONS = {"total": [0.5, 0.8, 0.3, 0.05]}
+
+def make_page(header=None, box=True, logo=False, body="Invoice 1"):
+    """Blank page with an optional vendor header, logo block and some body text"""
+    page = np.full((1100, 850, 3), 255, np.uint8)
+    if header:
+        cv2.putText(page, header, (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 4)
+    if box:
+        cv2.rectangle(page, (500, 30), (800, 150), (0, 0, 0), -1)
+    if logo:
+        cv2.circle(page, (700, 100), 60, (0, 0, 0), -1)
+    cv2.putText(page, body, (40, 600), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    return page
+
+def scan(page, sigma, shift, seed=0):
+    """Simulate a scan: sensor noise, a small offset and slight blur"""
+    rng = np.random.default_rng(seed)
+    noisy = np.clip(page.astype(np.int16) + rng.normal(0, sigma, page.shape), 0, 255).astype(np.uint8)
+    offset = np.float32([[1, 0, shift], [0, 1, shift]])
+    noisy = cv2.warpAffine(noisy, offset, (page.shape[1], page.shape[0]), borderValue=(255, 255, 255))
+    return cv2.GaussianBlur(noisy, (3, 3), 0)
+
+def test_vendor_templates(tmp_path):
+    """Noisy copies of a vendor match its template; blank headers and other vendors do not"""
+    path = str(tmp_path / "templates.json")
+    registry = TemplateRegistry(path)
+    registry.register("Acme", make_page("ACME CORP"), REGIONS)
+    registry.save()
+
+    registry = TemplateRegistry(path)
+    for sigma, shift in [(0, 0), (25, 3), (40, 5)]:
+        template = registry.match(scan(make_page("ACME CORP", body="Invoice 2"), sigma, shift))
+        assert template is not None and template.vendor == "Acme", (sigma, shift)
+    assert registry.templates[0].regions["total"] == (0.5, 0.8, 0.3, 0.05)
+
+    others = {
+        "blank": make_page(box=False),
+        "noisy blank": scan(make_page(box=False), 40, 0),
+        "layout without vendor name": make_page(),
+        "Zeta Ltd": make_page("Zeta Ltd"),
+        "Globex Inc": make_page("Globex Inc"),
+        "vendor with logo": make_page("Initech", box=False, logo=True),
+    }
+    for name, page in others.items():
+        assert registry.match(page) is None, name
+
+def test_template_regions_validated():
+    """Malformed or out-of-page region boxes are rejected at registration"""
+    registry = TemplateRegistry()
+    page = make_page("ACME CORP")
+    for regions in [{"total": [0.6, 0.8]}, {"total": [0.6, 0.8, 0.5, 0.1]},
+                    {"total": [0.1, 0.1, 0, 0.1]}, {"total": [0.1, 0.1, "a", 0.1]},
+                    {"subtotal": [0.1, 0.1, 0.1, 0.1]}]:
+        try:
+            registry.register("Acme", page, regions)
+            assert False, f"regions {regions} must be rejected"
+        except ValueError:
+            pass
+    try:
+        registry.register("Blank", make_page(box=False), REGIONS)
+        assert False, "a header without detail must be rejected"
+    except ValueError:
+        pass
+    assert registry.templates == []
+
+def test_template_report():
+    """Time saved comes from same-image baseline samples, less abandoned fallback attempts"""
+    registry = TemplateRegistry(baseline_every=2)
+    assert [registry.take_baseline_sample() for _ in range(4)] == [True, False, True, False]
+    registry.record("template", 0.5)
+    registry.record("template", 0.5)
+    registry.record("fallback", 2.5, attempt_seconds=0.5)
+    assert registry.report()["estimated_seconds_saved"] is None
+
+    registry.record_baseline(full_ocr_seconds=2.0, region_ocr_seconds=0.25)
+    report = registry.report()
+    assert report["match_rate"] == 2 / 3
+    assert report["fallback"] == 1
+    assert report["avg_full_seconds"] is None
+    assert report["avg_full_ocr_seconds"] == 2.0
+    assert report["estimated_seconds_saved"] == 3.0
+
+    assert not TemplateRegistry(baseline_every=0).take_baseline_sample()
+
+def test_template_field_parsing():
+    """Only money-shaped amounts are taken from total/tax regions"""
+    nlp_engine = NLPEngine()
+    financial_data, unparsed = nlp_engine.extract_template_fields({
+        "total": "Total (incl. 18% VAT) $1,180.00",
+        "tax": "Subtotal $1,000.00 VAT $180.00",
+        "invoice_id": "INVOICE NO: INV-2024-001"
+    })
+    assert financial_data["totals"] == ["$1,180.00"]
+    assert financial_data["taxes"] == ["$180.00"]
+    assert financial_data["ids"] == ["INV-2024-001"]
+    assert unparsed == []
+
+    financial_data, unparsed = nlp_engine.extract_template_fields({"total": "Page 1 of 2"})
+    assert financial_data["totals"] == []
+    assert unparsed == ["total"]
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_vendor_templates(pathlib.Path(tmp))
+    test_template_regions_validated()
+    test_template_report()
+    test_template_field_parsing()
+    print("Vendor templates tested!")